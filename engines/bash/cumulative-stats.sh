@@ -5,6 +5,8 @@
 # Two cache files (to avoid one project overwriting another's stats):
 #   $CACHE_DIR/proj-<hash>.json  — per-project, fast (~1-2s)
 #   $CACHE_DIR/all.json          — shared across projects (~14s)
+# plus a combined view so renderers need only one read:
+#   $CACHE_DIR/cum-<hash>.json   — {proj: <proj cache>, all: <all cache>}
 # CACHE_DIR defaults to ~/.cache/claude-code-statusline/
 #
 # statusline.sh reads both using the same CACHE_DIR convention.
@@ -271,3 +273,25 @@ if [ "$ALL_AGE" -ge "$CACHE_TTL" ]; then
     rm -rf "$ALL_LOCK"
   fi
 fi
+
+# =============================================
+# PART 3: Combined cache (single read for renderers)
+# Rebuilt from the two source caches whenever either was refreshed above
+# =============================================
+CUM_CACHE="$CACHE_DIR/cum-${PROJ_HASH}.json"
+if [ -f "$PROJ_CACHE" ] && [ -f "$ALL_CACHE" ]; then
+  CUM_MTIME=$(file_mtime "$CUM_CACHE")
+  if [ "$(file_mtime "$PROJ_CACHE")" -gt "$CUM_MTIME" ] || \
+     [ "$(file_mtime "$ALL_CACHE")" -gt "$CUM_MTIME" ]; then
+    TMPFILE=$(mktemp "$CACHE_DIR/tmp-cum.XXXXXX")
+    if jq -n \
+        --slurpfile proj "$PROJ_CACHE" \
+        --slurpfile all "$ALL_CACHE" \
+        '{ updated: $all[0].updated, proj: $proj[0], all: $all[0] }' \
+        > "$TMPFILE" 2>/dev/null; then
+      mv "$TMPFILE" "$CUM_CACHE"
+    else
+      rm -f "$TMPFILE"
+    fi
+  fi
+fi
@@ -4,6 +4,9 @@ import re
 import sys
 from html import escape
 
+# Compiled once at import — parse_ansi runs per line
+_ANSI_RE = re.compile(r"\033\[([0-9;]*)m")
+
 # ANSI code → CSS class mapping
 ANSI_MAP = {
     "0": "default",   # reset
@@ -66,9 +69,8 @@ def parse_ansi(text: str) -> list[tuple[str, str]]:
     segments = []
     current_class = "default"
     pos = 0
-    ansi_re = re.compile(r"\033\[([0-9;]*)m")
 
-    for match in ansi_re.finditer(text):
+    for match in _ANSI_RE.finditer(text):
         # Text before this escape
         before = text[pos : match.start()]
         if before:
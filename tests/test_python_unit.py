@@ -64,6 +64,119 @@ class TestShortenBranch:
         assert statusline.shorten_branch("") == ""
 
 
+def _gitstatusd_resp(*fields):
+    return b"\x1f".join(fields) + b"\x1e"
+
+
+class TestParseGitstatusdResponse:
+    # id, is_repo, workdir, commit, branch, upstream, remote, url, state,
+    # index_size, staged, unstaged, conflicted, untracked, ahead, behind,
+    # stashes
+    CLEAN = _gitstatusd_resp(
+        b"statusline", b"1", b"/repo", b"abc123", b"main", b"origin/main",
+        b"origin", b"url", b"", b"5", b"0", b"0", b"0", b"0", b"0", b"0",
+        b"0",
+    )
+
+    def test_clean_repo(self):
+        assert statusline._parse_gitstatusd_response(self.CLEAN) == (
+            "main", False, 0, 0, 0,
+        )
+
+    def test_dirty_with_counts(self):
+        resp = _gitstatusd_resp(
+            b"statusline", b"1", b"/repo", b"abc123", b"main",
+            b"origin/main", b"origin", b"url", b"", b"5", b"1", b"0", b"0",
+            b"2", b"3", b"1", b"4",
+        )
+        assert statusline._parse_gitstatusd_response(resp) == (
+            "main", True, 3, 1, 4,
+        )
+
+    def test_not_a_repo(self):
+        resp = _gitstatusd_resp(b"statusline", b"0")
+        assert statusline._parse_gitstatusd_response(resp) == (
+            "", False, 0, 0, 0,
+        )
+
+    def test_empty_output_falls_back(self):
+        assert statusline._parse_gitstatusd_response(b"") is None
+
+    def test_truncated_falls_back(self):
+        resp = _gitstatusd_resp(b"statusline", b"1", b"/repo", b"abc123")
+        assert statusline._parse_gitstatusd_response(resp) is None
+
+    def test_garbled_counters_fall_back(self):
+        resp = _gitstatusd_resp(
+            b"statusline", b"1", b"/repo", b"abc123", b"main",
+            b"origin/main", b"origin", b"url", b"", b"5", b"x", b"0", b"0",
+            b"0", b"0", b"0", b"0",
+        )
+        assert statusline._parse_gitstatusd_response(resp) is None
+
+    def test_daemon_off_by_default(self, monkeypatch):
+        def boom():
+            raise AssertionError("gitstatusd queried without opt-in")
+
+        monkeypatch.setattr(statusline, "_git_status_gitstatusd", boom)
+        monkeypatch.setattr(statusline, "git_cmd", lambda *a: "")
+        assert statusline.git_status() == ("", False, 0, 0, 0)
+
+
+class TestGitCacheTTL:
+    def test_disabled_by_default(self):
+        assert statusline._git_cache_ttl({}) == 0
+
+    def test_from_config(self):
+        cfg = {"STATUSLINE_GIT_CACHE_TTL": "30"}
+        assert statusline._git_cache_ttl(cfg) == 30
+
+    def test_garbage_value(self):
+        cfg = {"STATUSLINE_GIT_CACHE_TTL": "soon"}
+        assert statusline._git_cache_ttl(cfg) == 0
+
+    def test_settable_via_env_file(self, tmp_path, monkeypatch):
+        claude = tmp_path / ".claude"
+        claude.mkdir()
+        (claude / "statusline.env").write_text("STATUSLINE_GIT_CACHE_TTL=42\n")
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        monkeypatch.delenv("STATUSLINE_GIT_CACHE_TTL", raising=False)
+        cfg = statusline.load_config(statusline.parse_args())
+        assert statusline._git_cache_ttl(cfg) == 42
+
+    def test_roundtrip_with_ttl(self, tmp_path):
+        gitdir = tmp_path / ".git"
+        gitdir.mkdir()
+        (gitdir / "HEAD").write_text("ref: refs/heads/main\n")
+        cfg = {"STATUSLINE_GIT_CACHE_TTL": "30"}
+        result = ("main", "main", "●", "")
+        cache_dir = str(tmp_path / "cache")
+        statusline._git_cache_put(cfg, cache_dir, str(gitdir), result)
+        assert statusline._git_cache_get(cfg, cache_dir, str(gitdir)) == result
+
+    def test_no_cache_when_disabled(self, tmp_path):
+        gitdir = tmp_path / ".git"
+        gitdir.mkdir()
+        (gitdir / "HEAD").write_text("ref: refs/heads/main\n")
+        result = ("main", "main", "", "")
+        cache_dir = str(tmp_path / "cache")
+        statusline._git_cache_put({}, cache_dir, str(gitdir), result)
+        assert statusline._git_cache_get({}, cache_dir, str(gitdir)) is None
+
+    def test_invalidated_by_ref_change(self, tmp_path):
+        gitdir = tmp_path / ".git"
+        gitdir.mkdir()
+        head = gitdir / "HEAD"
+        head.write_text("ref: refs/heads/main\n")
+        cfg = {"STATUSLINE_GIT_CACHE_TTL": "30"}
+        result = ("main", "main", "", "")
+        cache_dir = str(tmp_path / "cache")
+        statusline._git_cache_put(cfg, cache_dir, str(gitdir), result)
+        head.write_text("ref: refs/heads/other-branch\n")
+        assert statusline._git_cache_get(cfg, cache_dir, str(gitdir)) is None
+
+
 class TestTrunc:
     def test_short(self):
         assert statusline.trunc("hello", 10) == "hello"